@@ -1,54 +1,91 @@
-﻿import sys
+﻿import os
+import sys
 import re
+import fnmatch
 from pathlib import Path
 
 # File extensions belonging to exported PowerBuilder source objects.
 # *.sr* → general source files (SRD, SRW, SRU…)
 # *.srd → DataWindow source
 # *.srs → Structure source
-EXTS = ["*.sr*", "*.srd", "*.srs"]
+EXTS = ("*.sr*", "*.srd", "*.srs")
+
+# All EXTS globs as one case-insensitive regex, so each name is tested once while walking.
+SOURCE_NAME_RE = re.compile("|".join(fnmatch.translate(p) for p in EXTS), re.IGNORECASE)
+
+def iter_source_paths(root: Path):
+    """
+    Yields the str path of every file matching EXTS below root.
+    Each directory is listed once with os.scandir; symlinked directories are
+    skipped, as are directories that disappear or deny access.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif SOURCE_NAME_RE.match(entry.name) and entry.is_file():
+                        yield entry.path
+        except (FileNotFoundError, PermissionError):
+            continue
 
 def collect_files(root: Path) -> list[Path]:
     """
     Recursively collects all PowerBuilder source files under the given root directory.
     Matches against the file extensions defined in EXTS.
-    Returns a sorted list of file paths, filtering out non-files.
+    Returns a sorted list of file paths; each file is listed once.
     """
-    files = []
-    for pattern in EXTS:
-        files.extend(root.rglob(pattern))
-    return sorted(p for p in files if p.is_file())
+    return sorted(Path(p) for p in iter_source_paths(root))
 
 def read_source(f: Path) -> str:
     """
     Reads a PowerBuilder source file while handling multiple possible encodings.
     Behavior:
       1) Detect UTF-16 (LE or BE) via BOM.
-      2) Attempt UTF-8 decoding.
-      3) Fallback to Windows-1252 for legacy ANSI files.
+      2) Decode pure ASCII directly.
+      3) Attempt UTF-8 decoding.
+      4) Fallback to Windows-1252 for legacy ANSI files.
     After decoding:
       - Removes null bytes.
       - Normalizes all newline formats to '\n'.
     Returns the decoded and cleaned text.
     """
-    raw = f.read_bytes()
+    with open(f, "rb", buffering=0) as handle:
+        raw = handle.read()
 
     # UTF-16 BOM detection
     if raw.startswith(b"\xff\xfe"):
         text = raw.decode("utf-16-le", errors="ignore")
     elif raw.startswith(b"\xfe\xff"):
         text = raw.decode("utf-16-be", errors="ignore")
+    elif raw.isascii():
+        # Pure ASCII (the common case) decodes without UTF-8 validation
+        text = raw.decode("ascii")
     else:
         # Prefer UTF-8, fallback to CP1252
         try:
             text = raw.decode("utf-8")
-        except:
+        except UnicodeDecodeError:
             text = raw.decode("windows-1252", errors="ignore")
 
     # Remove nulls and force normalized newlines
-    text = text.replace("\x00", "")
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return normalize_source_text(text)
 
+def normalize_source_text(text: str) -> str:
+    """
+    Removes null characters and normalizes all newline formats to '\n'.
+    Each replace only runs when its character is present, so clean text
+    costs a fast scan instead of a full copy per replace.
+    """
+    if "\x00" in text:
+        text = text.replace("\x00", "")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+        if "\r" in text:
+            text = text.replace("\r", "\n")
     return text
 
 def write_combined_file(files: list[Path], output_file: Path):
@@ -61,7 +98,8 @@ def write_combined_file(files: list[Path], output_file: Path):
     """
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_file.open("w", encoding="utf-8") as out:
+    # Large buffer: many small writes per source file, one flush per ~1 MB
+    with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as out:
         for f in files:
             text = read_source(f)
             out.write(f"\n\n--- FILE: {f} ---\n\n")
@@ -5,71 +5,151 @@ import json
 import time
 import shutil
 import ctypes
+import fnmatch
 import hashlib
 import tempfile
+import itertools
 import subprocess
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json produces the same layout
+    orjson = None
 
 # Versions supported by the mirror layout (Mirror/<version>/...).
-VERSIONS = ["6.5", "7.0", "8.0", "9.0", "10.5", "12.5"]
+VERSIONS = ("6.5", "7.0", "8.0", "9.0", "10.5", "12.5")
 
 # Enables/disables the final warnings summary output (kept for diagnostics).
 WARNINGS_ENABLED = False
 
 # File extensions belonging to exported PowerBuilder source objects.
-EXTS = ["*.sr*", "*.srd", "*.srs"]
+EXTS = ("*.sr*", "*.srd", "*.srs")
+
+# EXTS compiled into one pattern for scan_files; IGNORECASE matches like the Windows glob did.
+SOURCE_NAME_RE = re.compile("|".join(fnmatch.translate(p) for p in EXTS), re.IGNORECASE)
+
+# Workspace files discovered in the mirror (same walker, same case-insensitive matching).
+PBW_NAME_RE = re.compile(fnmatch.translate("*.pbw"), re.IGNORECASE)
 
 # Manifest schema for content-aware PBL fingerprints.
 FINGERPRINT_SCHEMA = 2
 
+# Source files read ahead by a thread pool while the current object is split/written.
+READ_AHEAD_THREADS = 8
+READ_AHEAD_FILES = 64
+
+# build_caches never asks for more processes than ProcessPoolExecutor allows on Windows.
+MAX_WORKERS = 61
+
+# Cache files are written with os.open/os.write; O_BINARY (Windows only) disables newline translation.
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
 # PBW parsing
-PBW_TARGETS_BLOCK_RE = re.compile(r"@begin\s+Targets(.*?)@end;", re.IGNORECASE | re.DOTALL)
-QUOTED_PATH_RE = re.compile(r'"([^"]+)"')
+# Run on the raw PBW bytes (ASCII syntax); only the quoted target paths are decoded.
+PBW_TARGETS_BLOCK_RE = re.compile(rb"@begin\s+Targets(.*?)@end;", re.IGNORECASE | re.DOTALL)
+QUOTED_PATH_RE = re.compile(rb'"([^"]+)"')
 
 # PBT parsing (covers LibList, Libs, AppLib)
-PBL_LIST_RE = re.compile(r'(liblist|libs|applib)\s*=?\s*"([^"]+)"', re.IGNORECASE)
+PBL_LIST_RE = re.compile(r'(?:liblist|libs|applib)\s*=?\s*"([^"]+)"', re.IGNORECASE)
 
-# Member splitting inside exported objects
+# Member splitting inside exported objects.
+# Patterns are scanned over the whole text in MULTILINE mode; [^\S\n] keeps each match on one line.
 MEMBER_START_RE = re.compile(
-    r"^\s*(public|private|protected)?\s*(function|subroutine|event)\s+(.+?)\s*$",
-    re.IGNORECASE,
+    r"^[^\S\n]*(?:public|private|protected)?[^\S\n]*(?P<kind>function|subroutine|event)[^\S\n]+(?P<sig>.+?)[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+MEMBER_END_RE = re.compile(
+    r"^[^\S\n]*end[^\S\n]+(?:function|subroutine|event)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+MEMBER_BOUNDARY_RE = re.compile(
+    f"{MEMBER_START_RE.pattern}|{MEMBER_END_RE.pattern}",
+    re.IGNORECASE | re.MULTILINE,
 )
-MEMBER_END_RE = re.compile(r"^\s*end\s+(function|subroutine|event)\b", re.IGNORECASE)
 
-# Single-member fallback extraction (object files that are essentially a single implementation)
-END_ANY_RE = re.compile(r"^\s*end\s+(function|subroutine|event)\b", re.IGNORECASE)
+# Single-member fallback extraction (object files that are essentially a single implementation).
+# Scanned over the whole text like the member patterns; [^\S\n] keeps each match on one line.
+END_ANY_RE = re.compile(
+    r"^[^\S\n]*end[^\S\n]+(function|subroutine|event)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Per-kind patterns, compiled once (callers only pass the member kinds above)
+MEMBER_KINDS = ("function", "subroutine", "event")
+END_KIND_RE = {
+    kind: re.compile(rf"^\s*end\s+{kind}\b", re.IGNORECASE) for kind in MEMBER_KINDS
+}
+START_KIND_RE = {
+    kind: re.compile(
+        rf"^[^\S\n]*(?:global|public|private|protected)?[^\S\n]*{kind}[^\S\n]+.+$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+    for kind in MEMBER_KINDS
+}
+
+# sanitize(): Windows-forbidden characters and all Unicode whitespace (str.isspace, as matched
+# by \s; the highest such code point is U+3000) map to "_" in one translate pass.
+SANITIZE_TABLE = str.maketrans(
+    dict.fromkeys('<>:"/\\|?*' + "".join(chr(c) for c in range(0x3001) if chr(c).isspace()), "_")
+)
+UNDERSCORES_RE = re.compile(r"_{2,}")
 
 
+@lru_cache(maxsize=8192)
 def sanitize(name: str) -> str:
-    """Sanitizes a name for filesystem usage (directory/file name)."""
-    name = name.strip()
-    name = re.sub(r'[<>:"/\\|?*]', "_", name)
-    name = re.sub(r"\s+", "_", name)
-    name = re.sub(r"_+", "_", name)
+    """
+    Sanitizes a name for filesystem usage (directory/file name).
+    Memoized: the same PBW/PBL/object names are sanitized many times per run.
+    """
+    name = name.strip().translate(SANITIZE_TABLE)
+    if "__" in name:
+        name = UNDERSCORES_RE.sub("_", name)
     return name.strip("_")
 
 
-def read_source_file(f: Path) -> str:
+def read_source_file(f: Union[str, Path]) -> str:
     """
     Reads a PowerBuilder source export file while handling multiple possible encodings.
     Normalizes newlines to '\n'.
+    Accepts plain str paths (as produced by scan_files) to skip pathlib overhead.
     """
-    raw = f.read_bytes()
+    with open(f, "rb", buffering=0) as handle:
+        raw = handle.read()
 
     # UTF-16 BOM detection
     if raw.startswith(b"\xff\xfe"):
         text = raw.decode("utf-16-le", errors="ignore")
     elif raw.startswith(b"\xfe\xff"):
         text = raw.decode("utf-16-be", errors="ignore")
+    elif raw.isascii():
+        # Most PB exports are plain ASCII: skip UTF-8 validation
+        text = raw.decode("ascii")
     else:
         try:
             text = raw.decode("utf-8")
-        except Exception:
+        except UnicodeDecodeError:
             text = raw.decode("windows-1252", errors="ignore")
 
-    text = text.replace("\x00", "")
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return normalize_source_text(text)
+
+
+def normalize_source_text(text: str) -> str:
+    """
+    Removes null characters and normalizes newlines to '\n'.
+    Each replace only runs when its character is present: a memchr-speed 'in' test is
+    much cheaper than a replace pass over already clean text.
+    """
+    if "\x00" in text:
+        text = text.replace("\x00", "")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+        if "\r" in text:
+            text = text.replace("\r", "\n")
     return text
 
 
@@ -77,15 +157,18 @@ def parse_pbw_targets(pbw_path: Path, warnings: List[str]) -> List[Path]:
     """
     Parses a PBW file and returns referenced PBT targets (existing only).
     """
-    txt = pbw_path.read_text(encoding="utf-8", errors="ignore")
-    m = PBW_TARGETS_BLOCK_RE.search(txt)
+    data = pbw_path.read_bytes()
+    m = PBW_TARGETS_BLOCK_RE.search(data)
     if not m:
         return []
 
-    block = m.group(1)
     pbts: List[Path] = []
 
-    for qp in QUOTED_PATH_RE.findall(block):
+    for raw in QUOTED_PATH_RE.findall(data, m.start(1), m.end(1)):
+        # Same text read_text(encoding="utf-8", errors="ignore") would have given
+        qp = raw.decode("utf-8", errors="ignore")
+        if "\r" in qp:
+            qp = qp.replace("\r\n", "\n").replace("\r", "\n")
         p = (pbw_path.parent / qp).resolve()
         if p.suffix.lower() != ".pbt":
             continue
@@ -94,15 +177,21 @@ def parse_pbw_targets(pbw_path: Path, warnings: List[str]) -> List[Path]:
         else:
             warnings.append(f"[AICodebase][WARN] Missing PBT referenced by PBW '{pbw_path.name}': {p}")
 
-    # Deterministic unique
-    seen: set[str] = set()
-    out: List[Path] = []
-    for p in sorted(pbts, key=lambda x: x.as_posix().lower()):
-        k = p.as_posix().lower()
-        if k not in seen:
-            seen.add(k)
-            out.append(p)
-    return out
+    # Deterministic unique: first path per case-insensitive key, ordered by key
+    unique: Dict[str, Path] = {}
+    for p in pbts:
+        unique.setdefault(p.as_posix().lower(), p)
+    return [unique[k] for k in sorted(unique)]
+
+
+def unique_ignore_case(items: Iterable[str]) -> List[str]:
+    """
+    Removes case-insensitive duplicates, preserving order (first spelling wins).
+    """
+    unique: Dict[str, str] = {}
+    for item in items:
+        unique.setdefault(item.lower(), item)
+    return list(unique.values())
 
 
 def parse_pbt_libs(pbt_path: Path) -> List[str]:
@@ -114,33 +203,48 @@ def parse_pbt_libs(pbt_path: Path) -> List[str]:
 
     txt = pbt_path.read_text(encoding="utf-8", errors="ignore")
 
-    pbls: List[str] = []
-    for m in PBL_LIST_RE.finditer(txt):
-        raw = m.group(2)
-        for entry in raw.split(";"):
-            clean = entry.strip()
-            if clean:
-                pbls.append(Path(clean).name)
-
-    # Unique preserving order
-    seen: set[str] = set()
-    out: List[str] = []
-    for p in pbls:
-        k = p.lower()
-        if k not in seen:
-            seen.add(k)
-            out.append(p)
-    return out
+    return unique_ignore_case(
+        Path(clean).name
+        for m in PBL_LIST_RE.finditer(txt)
+        for clean in (entry.strip() for entry in m.group(1).split(";"))
+        if clean
+    )
+
+
+def scan_files(root: Path, name_re: Pattern[str]) -> Iterator[os.DirEntry]:
+    """
+    Yields the DirEntry of each file below root whose name matches name_re.
+    Iterative os.scandir walk; linked directories are not entered and directories
+    that cannot be listed are skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif name_re.match(entry.name) and entry.is_file():
+                        yield entry
+        except (FileNotFoundError, PermissionError):
+            continue
+
+
+def path_sort_key(path: str) -> str:
+    """
+    Deterministic, case-insensitive sort key for a str path (same order as as_posix().lower()).
+    """
+    return path.replace(os.sep, "/").lower()
 
 
 def collect_object_files(pbl_sources_dir: Path) -> List[Path]:
     """
     Collects exported PB source files under a PBL directory in Sources/<version>/<pbl>/...
     """
-    files: List[Path] = []
-    for pattern in EXTS:
-        files.extend(pbl_sources_dir.rglob(pattern))
-    return sorted((p for p in files if p.is_file()), key=lambda x: x.as_posix().lower())
+    paths = [entry.path for entry in scan_files(pbl_sources_dir, SOURCE_NAME_RE)]
+    paths.sort(key=path_sort_key)
+    return [Path(p) for p in paths]
 
 
 def normalize_member_name(kind: str, signature: str) -> str:
@@ -162,81 +266,98 @@ def split_object_members(content: str) -> Tuple[str, List[Tuple[str, str]]]:
     """
     Splits an exported PB object into header_text and member blocks.
     Members include wrappers (first line + end line), stripped later.
+    A single MEMBER_BOUNDARY_RE scan finds the member start/end lines; header and
+    member text are sliced from content by offset.
     """
-    lines = content.split("\n")
-
-    header_lines: List[str] = []
+    header_parts: List[str] = []
     members: List[Tuple[str, str]] = []
 
-    in_member = False
+    # Offset of the first line not yet assigned to a member or to the header.
+    pos = 0
+    member_start = -1
     member_kind = ""
     member_sig = ""
-    member_buf: List[str] = []
-    pre_buf: List[str] = []
-
-    def flush_member() -> None:
-        nonlocal member_kind, member_sig, member_buf
-        if member_buf:
-            fname = normalize_member_name(member_kind, member_sig) + ".txt"
-            members.append((fname, "\n".join(member_buf).strip() + "\n"))
-        member_kind = ""
-        member_sig = ""
-        member_buf = []
-
-    for line in lines:
-        m = MEMBER_START_RE.match(line)
-        if not in_member and m:
-            header_lines.extend(pre_buf)
-            pre_buf = []
-
-            member_kind = m.group(2).lower()
-            member_sig = m.group(3).strip()
-            in_member = True
-            member_buf = [line]
+
+    def add_member(member_end: int) -> None:
+        fname = normalize_member_name(member_kind, member_sig) + ".txt"
+        members.append((fname, content[member_start:member_end].strip() + "\n"))
+
+    for m in MEMBER_BOUNDARY_RE.finditer(content):
+        is_start = m.group("kind") is not None
+
+        if member_start < 0:
+            if not is_start:
+                continue
+            if m.start() > pos:
+                header_parts.append(content[pos : m.start() - 1])
+            member_start = m.start()
+            member_kind = m.group("kind").lower()
+            member_sig = m.group("sig").strip()
             continue
 
-        if in_member:
-            member_buf.append(line)
-            if MEMBER_END_RE.match(line):
-                flush_member()
-                in_member = False
+        if is_start:
             continue
 
-        pre_buf.append(line)
+        line_end = content.find("\n", m.end())
+        if line_end < 0:
+            line_end = len(content)
+        add_member(line_end)
+        member_start = -1
+        pos = line_end + 1
 
-    if in_member:
-        flush_member()
+    if member_start >= 0:
+        add_member(len(content))
+        pos = len(content) + 1
 
-    header_lines.extend(pre_buf)
+    if pos <= len(content):
+        header_parts.append(content[pos:])
 
-    header_text = "\n".join(header_lines).strip()
+    header_text = "\n".join(header_parts).strip()
     if header_text:
         header_text += "\n"
     return header_text, members
 
 
+def last_line_end(text: str, start: int, end: int) -> int:
+    """
+    Returns the end offset of the last non-blank line of text[start:end]
+    ('\n'-separated, as split("\n") would give), or -1 if every line is blank.
+    """
+    while True:
+        nl = text.rfind("\n", start, end)
+        if text[nl + 1 if nl >= 0 else start : end].strip():
+            return end
+        if nl < 0:
+            return -1
+        end = nl
+
+
 def strip_member_wrappers(member_text: str, kind: str) -> str:
     """
     Safe wrapper stripping:
     - removes only the first line (declaration)
     - removes only the last 'end <kind>' line (if present)
+    Works on offsets into member_text; only the returned body is copied.
     """
-    lines = member_text.split("\n")
-
-    if lines:
-        lines.pop(0)
+    kind = kind.lower()
+    end_re = END_KIND_RE.get(kind) or re.compile(rf"^\s*end\s+{re.escape(kind)}\b", re.IGNORECASE)
 
-    while lines and lines[-1].strip() == "":
-        lines.pop()
+    first_nl = member_text.find("\n")
+    if first_nl < 0:
+        return ""
+    start = first_nl + 1
 
-    end_re = re.compile(rf"^\s*end\s+{re.escape(kind)}\b", re.IGNORECASE)
-    if lines and end_re.match(lines[-1]):
-        lines.pop()
+    end = last_line_end(member_text, start, len(member_text))
+    if end < 0:
+        return ""
 
-    while lines and lines[-1].strip() == "":
-        lines.pop()
+    nl = member_text.rfind("\n", start, end)
+    if end_re.match(member_text[nl + 1 if nl >= 0 else start : end]):
+        end = last_line_end(member_text, start, nl) if nl >= 0 else -1
+        if end < 0:
+            return ""
 
-    return "\n".join(lines) + ("\n" if lines else "")
+    return member_text[start:end] + "\n"
 
 
 def infer_kind_from_filename(fname: str) -> str:
@@ -255,60 +376,50 @@ def extract_single_member_body_if_any(content: str) -> Optional[str]:
       - finding the last 'end function|subroutine|event'
       - walking upwards to find the nearest matching start line for that kind
       - returning only the body (drop first + last line)
+    Both lookups are forward regex scans over content; the body is one slice.
     """
-    lines = content.split("\n")
-
-    end_idx = None
-    kind = None
-
-    for i in range(len(lines) - 1, -1, -1):
-        m = END_ANY_RE.match(lines[i])
-        if m:
-            kind = m.group(1).lower()
-            end_idx = i
-            break
-
-    if end_idx is None or kind is None:
-        return None
-
-    start_re = re.compile(
-        rf"^\s*(global|public|private|protected)?\s*{re.escape(kind)}\s+(.+?)\s*$",
-        re.IGNORECASE,
-    )
-
-    start_idx = None
-    for j in range(end_idx - 1, -1, -1):
-        if start_re.match(lines[j]):
-            start_idx = j
-            break
-
-    if start_idx is None:
+    end_m = None
+    for end_m in END_ANY_RE.finditer(content):
+        pass
+    if end_m is None:
         return None
 
-    block = lines[start_idx : end_idx + 1]
-    if len(block) < 2:
+    # Nearest start line above the end line: last match among the lines before it
+    start_m = None
+    for start_m in START_KIND_RE[end_m.group(1).lower()].finditer(content, 0, end_m.start()):
+        pass
+    if start_m is None:
         return None
 
-    body = "\n".join(block[1:-1]).strip()
+    body = content[content.find("\n", start_m.end()) + 1 : end_m.start()].strip()
     return body + ("\n" if body else "")
 
 
-def sha256_bytes(data: bytes) -> str:
-    h = hashlib.sha256()
-    h.update(data)
-    return h.hexdigest()
+def new_sha256():
+    """
+    Returns a sha256 object for change detection (not security): usedforsecurity=False
+    lets OpenSSL 3 skip its FIPS-approved code path. Falls back on Pythons without the flag.
+    """
+    try:
+        return hashlib.sha256(usedforsecurity=False)
+    except TypeError:
+        return hashlib.sha256()
 
 
-def sha256_file(path: Path) -> str:
+def sha256_file(path: Union[str, Path]) -> str:
     """
     Computes sha256 for a file using chunked reads to limit memory usage.
+    Chunks are read into one reused buffer instead of allocating a new bytes object each time.
     """
-    h = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            if not chunk:
+    h = new_sha256()
+    buf = bytearray(1024 * 1024)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as handle:
+        while True:
+            n = handle.readinto(buf)
+            if not n:
                 break
-            h.update(chunk)
+            h.update(view[:n])
     return h.hexdigest()
 
 
@@ -323,32 +434,37 @@ def compute_pbl_fingerprint(
       - content hash: sha256 per file
     Computes content hash for each file to guarantee detection even when timestamps are preserved.
     """
-    files = collect_object_files(pbl_sources_dir)
-
-    entries: List[Tuple[str, int, int, str]] = []
+    root = os.fspath(pbl_sources_dir)
+    prefix_len = len(os.path.join(root, ""))
+
+    # One walk: DirEntry.stat() reuses the data cached by scandir where the OS provides it.
+    entries: List[Tuple[str, os.DirEntry]] = []
+    for entry in scan_files(pbl_sources_dir, SOURCE_NAME_RE):
+        rel = entry.path[prefix_len:].replace(os.sep, "/")
+        entries.append((rel, entry))
+    entries.sort(key=lambda e: e[0].lower())
+
+    # Deterministic serialization, fed to the hash line by line.
+    h = new_sha256()
     files_map: Dict[str, Dict[str, object]] = {}
-    for f in files:
-        st = f.stat()
-        rel = f.relative_to(pbl_sources_dir).as_posix()
+    total_size = 0
+    mtime_max = 0
+    for i, (rel, entry) in enumerate(entries):
+        st = entry.stat()
         size = int(st.st_size)
         mtime_ns = int(st.st_mtime_ns)
-        file_sha = sha256_file(f)
+        file_sha = sha256_file(entry.path)
 
         files_map[rel] = {
             "size": size,
             "mtime_ns": mtime_ns,
             "sha256": file_sha,
         }
-        entries.append((rel, size, mtime_ns, file_sha))
-
-    # Deterministic serialization
-    blob = "\n".join(
-        f"{rel}|{size}|{mtime}|{file_sha}" for (rel, size, mtime, file_sha) in entries
-    ).encode("utf-8", errors="ignore")
-    fp = sha256_bytes(blob)
-
-    total_size = sum(e[1] for e in entries)
-    mtime_max = max((e[2] for e in entries), default=0)
+        line = f"{rel}|{size}|{mtime_ns}|{file_sha}"
+        h.update((line if i == 0 else "\n" + line).encode("utf-8", errors="ignore"))
+        total_size += size
+        mtime_max = max(mtime_max, mtime_ns)
+    fp = h.hexdigest()
 
     return {
         "fingerprint_schema": FINGERPRINT_SCHEMA,
@@ -363,23 +479,56 @@ def compute_pbl_fingerprint(
 def load_json(path: Path) -> Dict[str, object]:
     """
     Loads a JSON file as a dict, returning {} on missing/invalid content.
+    A non-empty file that cannot be parsed is reported: for the manifest it means
+    every PBL of the version gets rebuilt.
     """
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text(encoding="utf-8", errors="ignore"))
-    except Exception:
+        raw = path.read_bytes()
+    except OSError:
         return {}
+    if not raw.strip():
+        return {}
+    try:
+        if orjson is not None:
+            data = orjson.loads(raw)
+        else:
+            data = json.loads(raw.decode("utf-8", errors="ignore"))
+    except Exception as ex:
+        print(f"[AICodebase][WARN] Ignoring unreadable JSON file (full rebuild): {path} ({ex})")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def dump_json_bytes(data: Dict[str, object]) -> bytes:
+    """
+    Serializes data as 2-space indented UTF-8 JSON with platform newlines.
+    Uses orjson (C encoder) when installed; for data both encoders accept the output
+    is the same. orjson rejects lone surrogates (undecodable file names on Linux),
+    so such data goes through json, whose encode step drops them.
+    """
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    if payload is None:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8", errors="ignore")
+    if os.linesep != "\n":
+        payload = payload.replace(b"\n", os.linesep.encode("ascii"))
+    return payload
 
 
-def read_text_if_exists(path: Path) -> Optional[str]:
+def read_bytes_if_exists(path: Path) -> Optional[bytes]:
     """
-    Best-effort text read for an existing file, otherwise None.
+    Best-effort binary read for an existing file, otherwise None.
     """
     if not path.exists() or not path.is_file():
         return None
     try:
-        return path.read_text(encoding="utf-8", errors="ignore")
+        return path.read_bytes()
     except Exception:
         return None
 
@@ -407,8 +556,8 @@ def save_json(path: Path, data: Dict[str, object]) -> None:
     """
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    payload = json.dumps(data, indent=2, ensure_ascii=False)
-    existing = read_text_if_exists(path)
+    payload = dump_json_bytes(data)
+    existing = read_bytes_if_exists(path)
     if existing == payload:
         return
 
@@ -425,7 +574,7 @@ def save_json(path: Path, data: Dict[str, object]) -> None:
 
             fd, tmp_name = tempfile.mkstemp(prefix=f"{path.name}.tmp.", dir=str(path.parent))
             tmp_path = Path(tmp_name)
-            with os.fdopen(fd, "w", encoding="utf-8", errors="ignore") as handle:
+            with os.fdopen(fd, "wb") as handle:
                 handle.write(payload)
 
             set_file_attributes_normal_windows(tmp_path)
@@ -469,6 +618,20 @@ def ensure_removed(path: Path) -> None:
     path.unlink(missing_ok=True)
 
 
+def remove_unlisted_dirs(parent: Path, keep: Iterable[str]) -> None:
+    """
+    Removes subdirectories of parent whose name is not in keep.
+    Deletion order does not matter, so entries are not sorted.
+    """
+    try:
+        with os.scandir(parent) as it:
+            stale = [entry.path for entry in it if entry.name not in keep and entry.is_dir()]
+    except FileNotFoundError:
+        return
+    for path in stale:
+        ensure_removed(Path(path))
+
+
 def try_create_junction(dest_dir: Path, src_dir: Path) -> bool:
     """
     Creates a directory junction on Windows (best effort).
@@ -502,63 +665,183 @@ def copy_tree_incremental(src: Path, dst: Path) -> None:
     shutil.copytree(src, dst)
 
 
+def render_object_files(content: str) -> Dict[str, str]:
+    """
+    Builds the cache files of one exported object in memory: file name -> text.
+      - _object.txt: header (context)
+      - one file per member, without wrappers
+      - object.txt: single-implementation fallback when no member was found
+    """
+    header_text, members = split_object_members(content)
+
+    # _object.txt is kept as-is (context)
+    files: Dict[str, str] = {"_object.txt": header_text}
+
+    if not members:
+        cleaned = extract_single_member_body_if_any(content)
+        files["object.txt"] = cleaned if cleaned is not None else content
+        return files
+
+    for fname, body in sorted(members, key=lambda x: x[0].lower()):
+        kind = infer_kind_from_filename(fname)
+        files[fname] = strip_member_wrappers(body, kind)
+    return files
+
+
+def write_file_bytes(path: str, data: bytes) -> None:
+    """
+    Writes data to path through a raw file descriptor (no Python file object or buffer).
+    """
+    fd = os.open(path, WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def write_object_files(obj_dir: Path, files: Dict[str, str]) -> None:
+    """
+    Writes the cache files of one object in a single pass over its directory:
+      - unchanged files are not rewritten (size check first, then content)
+      - files no longer produced (removed members, stale object.txt) are deleted
+    Text is written with platform newlines, as write_text did.
+    """
+    # The directory listing doubles as the existence check: mkdir only for new objects.
+    # Keyed by normcase: on Windows a member renamed only in case opens the existing file,
+    # which must then not be deleted as stale.
+    try:
+        with os.scandir(obj_dir) as it:
+            existing = {os.path.normcase(entry.name): entry for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        obj_dir.mkdir(parents=True, exist_ok=True)
+        existing = {}
+
+    for name, text in files.items():
+        if os.linesep != "\n":
+            text = text.replace("\n", os.linesep)
+        data = text.encode("utf-8", errors="ignore")
+
+        entry = existing.pop(os.path.normcase(name), None)
+        if entry is not None and entry.stat().st_size == len(data):
+            with open(entry.path, "rb", buffering=0) as handle:
+                if handle.read() == data:
+                    continue
+        write_file_bytes(os.path.join(obj_dir, name), data)
+
+    for entry in existing.values():
+        os.unlink(entry.path)
+
+
+def unchanged_object_stems(
+    previous_files: Dict[str, Dict[str, object]],
+    current_files: Dict[str, Dict[str, object]],
+) -> set[str]:
+    """
+    Returns the object dirs (sanitized stems) whose source files are identical to the
+    previous build, comparing the manifest 'files' maps (relative path -> size/sha256).
+    An object is changed if any of its sources was added, removed or modified.
+    """
+    changed: set[str] = set()
+    for rel in previous_files.keys() | current_files.keys():
+        old = previous_files.get(rel)
+        new = current_files.get(rel)
+        if (
+            not isinstance(old, dict)
+            or new is None
+            or old.get("sha256") != new.get("sha256")
+            or old.get("size") != new.get("size")
+        ):
+            changed.add(sanitize(PurePosixPath(rel).stem))
+    return {sanitize(PurePosixPath(rel).stem) for rel in current_files} - changed
+
+
+def read_ahead(pool: Executor, func: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Yields func(item) for each item in order, keeping up to `window` calls in flight on pool.
+    Bounds memory while letting file reads (which release the GIL) overlap the caller's work.
+    """
+    items = iter(items)
+    pending = deque(pool.submit(func, item) for item in itertools.islice(items, window))
+    while pending:
+        future = pending.popleft()
+        for item in itertools.islice(items, 1):
+            pending.append(pool.submit(func, item))
+        yield future.result()
+
+
 def build_cache_for_pbl(
     version: str,
     pbl_stem: str,
     pbl_sources_dir: Path,
     cache_pbl_dir: Path,
+    previous_files: Optional[Dict[str, Dict[str, object]]] = None,
+    current_files: Optional[Dict[str, Dict[str, object]]] = None,
 ) -> None:
     """
     Builds/updates cache output for a single PBL:
       .pblcache/<PBL>/<object>/{_object.txt, function_*.txt, ...}
     Also deletes cache objects that no longer exist in Sources.
+    With both fingerprint 'files' maps given, objects whose sources are unchanged and
+    whose cache dir exists are not read or rewritten.
     """
     cache_pbl_dir.mkdir(parents=True, exist_ok=True)
 
-    # Current inputs
-    obj_files = collect_object_files(pbl_sources_dir)
-
-    # Build set of expected object dirs (by sanitized stem)
-    expected_obj_dirs: set[str] = set()
-
-    for f in obj_files:
-        obj_stem = sanitize(f.stem)
-        expected_obj_dirs.add(obj_stem)
-
-        obj_dir = cache_pbl_dir / obj_stem
-        obj_dir.mkdir(parents=True, exist_ok=True)
-
-        content = read_source_file(f)
-        header_text, members = split_object_members(content)
+    unchanged: set[str] = set()
+    if previous_files is not None and current_files is not None:
+        unchanged = unchanged_object_stems(previous_files, current_files)
+
+    # Current inputs, grouped by object dir (sanitized stem) so each dir is written once
+    objects: Dict[str, List[Path]] = {}
+    for f in collect_object_files(pbl_sources_dir):
+        objects.setdefault(sanitize(f.stem), []).append(f)
+
+    pending = [
+        (obj_stem, sources)
+        for obj_stem, sources in objects.items()
+        if not (obj_stem in unchanged and (cache_pbl_dir / obj_stem).is_dir())
+    ]
+
+    with ThreadPoolExecutor(max_workers=READ_AHEAD_THREADS) as pool:
+        contents = read_ahead(
+            pool,
+            read_source_file,
+            (f for _, sources in pending for f in sources),
+            READ_AHEAD_FILES,
+        )
+        for obj_stem, sources in pending:
+            files: Dict[str, str] = {}
+            for _ in sources:
+                rendered = render_object_files(next(contents))
+                files.update(rendered)
+                # A later source with members replaces an earlier single-implementation fallback
+                if "object.txt" not in rendered:
+                    files.pop("object.txt", None)
 
-        # _object.txt is kept as-is (context)
-        (obj_dir / "_object.txt").write_text(header_text, encoding="utf-8", errors="ignore")
+            write_object_files(cache_pbl_dir / obj_stem, files)
 
-        if not members:
-            cleaned = extract_single_member_body_if_any(content)
-            if cleaned is not None:
-                (obj_dir / "object.txt").write_text(cleaned, encoding="utf-8", errors="ignore")
-            else:
-                (obj_dir / "object.txt").write_text(content, encoding="utf-8", errors="ignore")
-            continue
+    # Delete cache object directories that are no longer present in Sources
+    remove_unlisted_dirs(cache_pbl_dir, objects)
 
-        # Write each member as its own file, without wrappers.
-        for fname, body in sorted(members, key=lambda x: x[0].lower()):
-            kind = infer_kind_from_filename(fname)
-            cleaned = strip_member_wrappers(body, kind)
-            (obj_dir / fname).write_text(cleaned, encoding="utf-8", errors="ignore")
 
-        # If previously we had object.txt fallback, remove it to avoid stale artifacts
-        stale_object_txt = obj_dir / "object.txt"
-        if stale_object_txt.exists():
-            stale_object_txt.unlink(missing_ok=True)
+def build_caches(version: str, tasks: List[Tuple]) -> None:
+    """
+    Runs build_cache_for_pbl(version, *task) for each task
+    (pbl_stem, pbl_sources_dir, cache_pbl_dir, previous_files, current_files).
+    PBLs are independent and the work is CPU-bound, so several tasks are spread over
+    a process pool; a single task runs in-process to avoid the pool start-up cost.
+    """
+    workers = min(len(tasks), os.cpu_count() or 1, MAX_WORKERS)
+    if workers <= 1:
+        for task in tasks:
+            build_cache_for_pbl(version, *task)
+        return
 
-    # Delete cache object directories that are no longer present in Sources
-    for child in sorted(cache_pbl_dir.iterdir(), key=lambda p: p.name.lower()):
-        if not child.is_dir():
-            continue
-        if child.name not in expected_obj_dirs:
-            ensure_removed(child)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_cache_for_pbl, version, *task) for task in tasks]
+        for future in futures:
+            future.result()
 
 
 def discover_pbw_to_pbls(
@@ -568,24 +851,24 @@ def discover_pbw_to_pbls(
     """
     Discovers PBWs in a mirror version folder and resolves their PBL list.
     Returns mapping: pbw_name (stem) -> list of pbl filenames (ordered, unique).
+    Workspaces often share targets; each PBT is parsed once per version.
     """
     pbw_map: Dict[str, List[str]] = {}
+    pbt_libs: Dict[Path, List[str]] = {}
+
+    def libs_of(pbt: Path) -> List[str]:
+        libs = pbt_libs.get(pbt)
+        if libs is None:
+            libs = pbt_libs[pbt] = parse_pbt_libs(pbt)
+        return libs
 
-    pbws = sorted(version_mirror.rglob("*.pbw"), key=lambda p: p.as_posix().lower())
-    for pbw in pbws:
+    pbw_paths = sorted((entry.path for entry in scan_files(version_mirror, PBW_NAME_RE)), key=path_sort_key)
+    for pbw_path in pbw_paths:
+        pbw = Path(pbw_path)
         pbw_name = sanitize(pbw.stem)
         pbts = parse_pbw_targets(pbw, warnings)
 
-        seen_pbl: set[str] = set()
-        pbl_list: List[str] = []
-        for pbt in pbts:
-            for pbl in parse_pbt_libs(pbt):
-                k = pbl.lower()
-                if k not in seen_pbl:
-                    seen_pbl.add(k)
-                    pbl_list.append(pbl)
-
-        pbw_map[pbw_name] = pbl_list
+        pbw_map[pbw_name] = unique_ignore_case(pbl for pbt in pbts for pbl in libs_of(pbt))
 
     return pbw_map
 
@@ -603,23 +886,13 @@ def cleanup_not_in_mirror(
     """
     # 1) PBW output cleanup (ignore cache folder)
     allowed_pbws = set(pbw_map.keys())
-
-    if version_out.exists():
-        for child in sorted(version_out.iterdir(), key=lambda p: p.name.lower()):
-            if child.name == ".pblcache":
-                continue
-            if child.is_dir() and child.name not in allowed_pbws:
-                ensure_removed(child)
+    allowed_pbws.add(".pblcache")
+    remove_unlisted_dirs(version_out, allowed_pbws)
 
     # 2) Inside each PBW, remove PBLs not listed
     for pbw_name, pbls in pbw_map.items():
-        pbw_dir = version_out / pbw_name
-        if not pbw_dir.exists():
-            continue
         allowed_pbl_dirs = set(sanitize(Path(p).stem) for p in pbls)
-        for child in sorted(pbw_dir.iterdir(), key=lambda p: p.name.lower()):
-            if child.is_dir() and child.name not in allowed_pbl_dirs:
-                ensure_removed(child)
+        remove_unlisted_dirs(version_out / pbw_name, allowed_pbl_dirs)
 
     # 3) Cache cleanup: remove cache PBL dirs not referenced by any PBW
     required_pbls: set[str] = set()
@@ -627,14 +900,7 @@ def cleanup_not_in_mirror(
         for p in pbls:
             required_pbls.add(sanitize(Path(p).stem))
 
-    if cache_dir.exists():
-        for child in sorted(cache_dir.iterdir(), key=lambda p: p.name.lower()):
-            if not child.is_dir():
-                continue
-            if child.name == ".manifest.json" or child.name == "_manifest.json":
-                continue
-            if child.name not in required_pbls:
-                ensure_removed(child)
+    remove_unlisted_dirs(cache_dir, required_pbls)
 
 
 def parse_scope_args(argv: List[str]) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
@@ -717,28 +983,20 @@ def process_version(
 
     version_out.mkdir(parents=True, exist_ok=True)
 
+    # PBL folder names (sanitized stems) per PBW, derived once from the PBL filenames
+    pbw_stems = {pbw_name: [sanitize(Path(p).stem) for p in pbls] for pbw_name, pbls in pbw_map.items()}
+
     if project_filter is None:
         cleanup_not_in_mirror(version_out, cache_dir, pbw_map)
     else:
         # Targeted cleanup for selected PBW only.
-        for pbw_name, pbls in pbw_map.items():
-            pbw_dir = version_out / pbw_name
-            if not pbw_dir.exists():
-                continue
-            allowed_pbl_dirs = set(sanitize(Path(p).stem) for p in pbls)
-            for child in sorted(pbw_dir.iterdir(), key=lambda p: p.name.lower()):
-                if child.is_dir() and child.name not in allowed_pbl_dirs:
-                    ensure_removed(child)
-
-    required_pbls: List[str] = []
-    seen_req: set[str] = set()
-    for pbw_name in sorted(pbw_map.keys(), key=lambda s: s.lower()):
-        for pbl in pbw_map[pbw_name]:
-            pbl_stem = sanitize(Path(pbl).stem)
-            if pbl_stem not in seen_req:
-                seen_req.add(pbl_stem)
-                required_pbls.append(pbl_stem)
+        for pbw_name, pbl_stems in pbw_stems.items():
+            remove_unlisted_dirs(version_out / pbw_name, set(pbl_stems))
 
+    required_pbls = {pbl_stem for pbl_stems in pbw_stems.values() for pbl_stem in pbl_stems}
+
+    rebuild_tasks: List[Tuple] = []
+    rebuild_fps: Dict[str, Dict[str, object]] = {}
     for pbl_stem in sorted(required_pbls, key=lambda s: s.lower()):
         pbl_sources_dir = version_sources / pbl_stem
         if not pbl_sources_dir.exists():
@@ -759,16 +1017,22 @@ def process_version(
             manifest["pbls"][pbl_stem] = fp
             continue
 
-        build_cache_for_pbl(version, pbl_stem, pbl_sources_dir, cache_pbl_dir)
-        manifest["pbls"][pbl_stem] = fp
+        # Objects whose sources are unchanged since the last build are skipped (not on migration).
+        previous_files = None if schema_migrating else old.get("files")
+        if not isinstance(previous_files, dict):
+            previous_files = None
+        rebuild_tasks.append((pbl_stem, pbl_sources_dir, cache_pbl_dir, previous_files, fp["files"]))
+        rebuild_fps[pbl_stem] = fp
+
+    build_caches(version, rebuild_tasks)
+    manifest["pbls"].update(rebuild_fps)
 
-    for pbw_name in sorted(pbw_map.keys(), key=lambda s: s.lower()):
+    for pbw_name in sorted(pbw_stems.keys(), key=lambda s: s.lower()):
         out_pbw_dir = version_out / pbw_name
         out_pbw_dir.mkdir(parents=True, exist_ok=True)
-        manifest["pbws"][pbw_name] = [sanitize(Path(p).stem) for p in pbw_map[pbw_name]]
+        manifest["pbws"][pbw_name] = pbw_stems[pbw_name]
 
-        for pbl in pbw_map[pbw_name]:
-            pbl_stem = sanitize(Path(pbl).stem)
+        for pbl_stem in pbw_stems[pbw_name]:
             cache_pbl_dir = cache_dir / pbl_stem
             if not cache_pbl_dir.exists():
                 continue
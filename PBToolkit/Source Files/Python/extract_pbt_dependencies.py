@@ -1,4 +1,8 @@
-﻿import re
+﻿import fnmatch
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 import sys
 
@@ -9,19 +13,41 @@ MIRROR_ROOT = Path(sys.argv[1])
 OUTPUT_ROOT = Path(sys.argv[2])
 
 # PowerBuilder versions expected inside the mirror structure.
-VERSIONS = ["6.5", "7.0", "8.0", "9.0", "10.5", "12.5"]
+VERSIONS = ("6.5", "7.0", "8.0", "9.0", "10.5", "12.5")
+
+# Minimum number of .pbt files per worker process; smaller mirrors run in-process
+# because pool start-up would cost more than the parsing it saves.
+PBTS_PER_WORKER = 16
+
+# Windows rejects a ProcessPoolExecutor with more than 61 workers.
+MAX_WORKERS = 61
+
+# Name pattern of PowerBuilder libraries (case-insensitive, as on Windows).
+PBL_NAME_RE = re.compile(fnmatch.translate("*.pbl"), re.IGNORECASE)
+
+# sanitize(): Windows-forbidden characters and any whitespace (every str.isspace
+# code point, as matched by \s; the highest is U+3000) are mapped to "_".
+SANITIZE_TABLE = str.maketrans(
+    dict.fromkeys('<>:"/\\|?*' + "".join(chr(c) for c in range(0x3001) if chr(c).isspace()), "_")
+)
+UNDERSCORES_RE = re.compile(r"_{2,}")
+
+# Trailing whitespace of every line (what line.rstrip() removes), in one pass.
+TRAILING_WS_RE = re.compile(r"[^\S\n]+$", re.MULTILINE)
 
 # Regex to extract PBLs from declarations such as:
 # applib "xxx"; libs="a.pbl;b.pbl"; liblist "c.pbl"
+# Both PBT patterns run on the raw file bytes (the PBT syntax is ASCII);
+# only the captured PBL references are decoded.
 PBL_LIST_RE = re.compile(
-    r'(liblist|libs|applib)\s*=?\s*"([^"]+)"',
+    rb'(liblist|libs|applib)\s*=?\s*"([^"]+)"',
     re.IGNORECASE
 )
 
 # Regex to extract PBL references from project-style strings like:
 # "1&something&file.pbl"
 PROJECT_PBL_RE = re.compile(
-    r'"\s*[^"&]*&[^"&]*&([^"]+)"'
+    rb'"\s*[^"&]*&[^"&]*&([^"]+)"'
 )
 
 def sanitize(name: str) -> str:
@@ -29,10 +55,9 @@ def sanitize(name: str) -> str:
     Produces a filesystem-safe, cross-platform identifier.
     Deterministic, stable, and collision-resistant enough for PB projects.
     """
-    name = name.strip()
-    name = re.sub(r'[<>:"/\\|?*]', '_', name)   # Windows forbidden
-    name = re.sub(r'\s+', '_', name)            # Any whitespace → _
-    name = re.sub(r'_+', '_', name)              # Collapse
+    name = name.strip().translate(SANITIZE_TABLE)  # Windows forbidden / whitespace → _
+    if "__" in name:
+        name = UNDERSCORES_RE.sub("_", name)        # Collapse
     return name.strip('_')
 
 def normalize_pbl_name(raw: str) -> str:
@@ -42,6 +67,26 @@ def normalize_pbl_name(raw: str) -> str:
     """
     return Path(raw).name
 
+def unique_ignore_case(items) -> list[str]:
+    """
+    Drops names that repeat an earlier one ignoring case; the order and the
+    spelling of the first occurrence are kept.
+    """
+    unique = {}
+    for item in items:
+        unique.setdefault(item.lower(), item)
+    return list(unique.values())
+
+def decode_capture(raw: bytes) -> str:
+    """
+    Decodes a captured value the way read_text(encoding="utf-8", errors="ignore")
+    would have: invalid bytes dropped, newlines translated.
+    """
+    text = raw.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
 def extract_pbl_from_pbt(pbt_path: Path) -> list[str]:
     """
     Parses a .pbt project file and extracts all referenced PBLs.
@@ -50,45 +95,62 @@ def extract_pbl_from_pbt(pbt_path: Path) -> list[str]:
       2) PBL_LIST_RE for applib/libs/liblist definitions.
     Returns a deduplicated list preserving the order of appearance.
     """
-    text = pbt_path.read_text(encoding="utf-8", errors="ignore")
+    data = pbt_path.read_bytes()
     pbls = []
 
     # Extract PBLs from project-encoded lines (@begin Projects section)
-    for m in PROJECT_PBL_RE.finditer(text):
-        pbls.append(normalize_pbl_name(m.group(1).strip()))
+    for m in PROJECT_PBL_RE.finditer(data):
+        clean = decode_capture(m.group(1)).strip()
+        if clean:
+            pbls.append(normalize_pbl_name(clean))
 
     # Extract PBLs from applib/libs/liblist definitions
-    for m in PBL_LIST_RE.finditer(text):
-        raw = m.group(2)
+    for m in PBL_LIST_RE.finditer(data):
+        raw = decode_capture(m.group(2))
         for entry in raw.split(";"):
             clean = entry.strip()
             if clean:
                 pbls.append(normalize_pbl_name(clean))
 
     # Remove duplicates while keeping the original order
-    seen = set()
-    result = []
-    for p in pbls:
-        key = p.lower()
-        if key not in seen:
-            seen.add(key)
-            result.append(p)
+    return unique_ignore_case(pbls)
 
-    return result
+def scan_pbl_names(root: Path) -> list[str]:
+    """
+    Returns the lowercase name of every *.pbl entry under root, gathered in a
+    single os.scandir pass that does not descend into linked directories.
+    """
+    names = []
+    stack = [os.fspath(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if PBL_NAME_RE.match(entry.name):
+                        names.append(entry.name.lower())
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except (FileNotFoundError, PermissionError):
+            continue
+    return names
 
 def load_all_pbl_from_mirror() -> set[str]:
     """
     Scans all version directories inside the mirror and returns a set
     of all available PBL filenames (lowercase).
     Used to check whether referenced PBLs are actually present.
+    Versions are walked in parallel threads (scandir releases the GIL).
     """
+    folders = [MIRROR_ROOT / version for version in VERSIONS]
+    folders = [folder for folder in folders if folder.exists()]
+
     all_pbl = set()
-    for version in VERSIONS:
-        folder = MIRROR_ROOT / version
-        if not folder.exists():
-            continue
-        for p in folder.rglob("*.pbl"):
-            all_pbl.add(p.name.lower())
+    if not folders:
+        return all_pbl
+    with ThreadPoolExecutor(max_workers=len(folders)) as pool:
+        for names in pool.map(scan_pbl_names, folders):
+            all_pbl.update(names)
     return all_pbl
 
 def normalize_text(text: str) -> str:
@@ -97,7 +159,7 @@ def normalize_text(text: str) -> str:
     of identical files. Ensures deterministic output.
     """
     text = text.replace("\r\n", "\n")
-    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = TRAILING_WS_RE.sub("", text)
     text = text.rstrip()
     return text + "\n"
 
@@ -105,15 +167,22 @@ def write_if_changed(path: Path, content: str):
     """
     Writes 'content' to file only if the normalized version differs from
     the existing file. Prevents unnecessary updates.
+    The file holds exactly what a previous run wrote (normalized text with
+    platform newlines), so a size check and a byte comparison are enough:
+    the existing file is never decoded or re-normalized.
     """
     new = normalize_text(content)
+    if os.linesep != "\n":
+        new = new.replace("\n", os.linesep)
+    data = new.encode("utf-8")
 
-    if path.exists():
-        old = normalize_text(path.read_text(encoding="utf-8", errors="ignore"))
-        if old == new:
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
             return  # No change → skip write
+    except FileNotFoundError:
+        pass
 
-    path.write_text(new, encoding="utf-8")
+    path.write_bytes(data)
 
 def build_output_folder(pbt: Path, version_dir: Path) -> str:
     """
@@ -135,19 +204,54 @@ def build_txt_filename(pbt: Path) -> str:
     """
     return f"{sanitize(pbt.name)}.txt"
 
+def process_pbt(pbt: Path, version: str, version_dir: Path, out_dir: Path, all_pbl: set[str]):
+    """
+    Writes the report of a single .pbt file:
+      - Extract referenced PBLs.
+      - List present and missing references.
+      - Create the flattened folder and the .txt named after the .pbt.
+    Runs in a worker process when the mirror is large enough.
+    """
+    pbls = extract_pbl_from_pbt(pbt)
+
+    # Build content for the output report
+    lines = [
+        f"Project: {pbt.name}",
+        f"Version: {version}",
+        "PBLs:",
+    ]
+
+    for pbl in pbls:
+        if pbl.lower() in all_pbl:
+            lines.append(f" - {pbl}")
+        else:
+            lines.append(f" - {pbl} (NOT FOUND)")
+
+    content = "\n".join(lines)
+
+    # Build folder name (sanitized)
+    folder_name = build_output_folder(pbt, version_dir)
+    target_dir = out_dir / folder_name
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    # Build .txt filename (sanitized)
+    txt_name = build_txt_filename(pbt)
+    out_file = target_dir / txt_name
+
+    # Write only if content changed
+    write_if_changed(out_file, content)
+
 def main():
     """
     Main execution workflow:
       - Load all existing PBLs from the mirror.
       - For each version, scan all .pbt files.
-      - Extract referenced PBLs.
-      - Generate a text report listing present and missing references.
-      - Create a folder per .pbt using flattening rules.
-      - Inside that folder, create a .txt with the same name as the .pbt.
-      - Write the report using a stable/normalized output format.
+      - Write one report per .pbt (see process_pbt), spreading
+        the files over a process pool when there are many.
     """
     ALL_PBL = load_all_pbl_from_mirror()
 
+    tasks = []
     for version in VERSIONS:
         version_dir = MIRROR_ROOT / version
         if not version_dir.exists():
@@ -156,36 +260,20 @@ def main():
         out_dir = OUTPUT_ROOT / version
         out_dir.mkdir(parents=True, exist_ok=True)
 
-        # Process each project file within the version folder
+        # Collect each project file within the version folder
         for pbt in version_dir.rglob("*.pbt"):
-            pbls = extract_pbl_from_pbt(pbt)
-
-            # Build content for the output report
-            lines = [
-                f"Project: {pbt.name}",
-                f"Version: {version}",
-                "PBLs:",
-            ]
-
-            for pbl in pbls:
-                if pbl.lower() in ALL_PBL:
-                    lines.append(f" - {pbl}")
-                else:
-                    lines.append(f" - {pbl} (NOT FOUND)")
-
-            content = "\n".join(lines)
-
-            # Build folder name (sanitized)
-            folder_name = build_output_folder(pbt, version_dir)
-            target_dir = out_dir / folder_name
-            target_dir.mkdir(parents=True, exist_ok=True)
-
-            # Build .txt filename (sanitized)
-            txt_name = build_txt_filename(pbt)
-            out_file = target_dir / txt_name
-
-            # Write only if content changed
-            write_if_changed(out_file, content)
+            tasks.append((pbt, version, version_dir, out_dir))
+
+    workers = min(len(tasks) // PBTS_PER_WORKER, os.cpu_count() or 1, MAX_WORKERS)
+    if workers <= 1:
+        for task in tasks:
+            process_pbt(*task, ALL_PBL)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Drain the results: a .pbt that fails in a worker stops the run
+        for _ in pool.map(partial(process_pbt, all_pbl=ALL_PBL), *zip(*tasks), chunksize=PBTS_PER_WORKER):
+            pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
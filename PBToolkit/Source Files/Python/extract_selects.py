@@ -1,7 +1,25 @@
-﻿import re
+﻿import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Patterns used for every line of every Converted file, compiled once.
+SELECT_RE = re.compile(r"\bselect\b", re.IGNORECASE)
+END_RE = re.compile(r"^end\b", re.IGNORECASE)
+BLANK_LINES_RE = re.compile(r"\n{2,}")
+
+# Line boundaries str.splitlines() honours besides "\n" (after "\r\n" is folded to "\n").
+OTHER_LINE_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+ASCII_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e"
+
+# Minimum number of Converted files per worker process; smaller trees run in-process
+# because pool start-up would cost more than the extraction it saves.
+FILES_PER_WORKER = 8
+
+# Upper bound on worker processes; 61 is the most max_workers Windows accepts.
+MAX_WORKERS = 61
+
 
 def read_clean_text(path: Path) -> str:
     """
@@ -18,10 +36,33 @@ def read_clean_text(path: Path) -> str:
 
     # Normalize line endings and collapse excessive blank lines
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = re.sub(r"\n{2,}", "\n", text)
+    text = BLANK_LINES_RE.sub("\n", text)
     return text
 
 
+def find_select(text: str, folded, pos: int) -> int:
+    """
+    Returns the offset of the next whole-word 'select' (any case) at or after pos, or -1.
+
+    folded is text.lower() for ASCII text: str.find on it is much cheaper than a
+    case-insensitive regex search, and ASCII lowercasing keeps offsets aligned.
+    Other text (folded is None) goes through SELECT_RE so Unicode matching stays exact.
+    """
+    if folded is None:
+        m = SELECT_RE.search(text, pos)
+        return m.start() if m else -1
+
+    while True:
+        i = folded.find("select", pos)
+        if i < 0:
+            return i
+        before = folded[i - 1] if i else " "
+        after = folded[i + 6] if i + 6 < len(folded) else " "
+        if not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_"):
+            return i
+        pos = i + 1
+
+
 def extract_selects_pb(text: str) -> list[str]:
     """
     Extracts SQL SELECT blocks from PowerBuilder-generated source text.
@@ -32,33 +73,53 @@ def extract_selects_pb(text: str) -> list[str]:
 
     Returns a list of raw SELECT blocks preserving original formatting.
     """
-    selects = []
-    buf = []
-    inside = False
-    select_re = re.compile(r"(?i)\bselect\b")
+    # Lines are split on "\n" only; fold the other splitlines() boundaries into it first.
+    text = text.replace("\r\n", "\n")
+    is_ascii = text.isascii()
+    if is_ascii:
+        if any(ch in text for ch in ASCII_LINE_BREAKS):
+            text = OTHER_LINE_BREAKS_RE.sub("\n", text)
+    elif OTHER_LINE_BREAKS_RE.search(text):
+        text = OTHER_LINE_BREAKS_RE.sub("\n", text)
 
-    for line in text.splitlines():
-        stripped = line.strip()
+    folded = text.lower() if is_ascii else None
 
-        # Detect start of SELECT block
-        if select_re.search(stripped):
-            if inside and buf:
+    selects = []
+    size = len(text)
+    pos = 0
+
+    # Outside a block, jump straight to the next line containing 'select'
+    # instead of testing every line; only lines inside a block are walked.
+    while True:
+        found = find_select(text, folded, pos)
+        if found < 0:
+            break
+
+        start = text.rfind("\n", 0, found) + 1
+        buf = []
+
+        while start < size:
+            end = text.find("\n", start)
+            if end < 0:
+                end = size
+            line = text[start:end]
+            stripped = line.strip()
+            start = end + 1
+
+            # A new SELECT inside a block closes the current one
+            if buf and SELECT_RE.search(stripped):
                 selects.append("\n".join(buf).strip())
                 buf = []
-            inside = True
 
-        if inside:
             buf.append(line.rstrip())
 
             # Detect end of SELECT block
-            if stripped.endswith(";") or re.match(r"(?i)^end\b", stripped):
-                selects.append("\n".join(buf).strip())
-                buf = []
-                inside = False
+            if stripped.endswith(";") or END_RE.match(stripped):
+                break
 
-    # Handle unterminated SELECT at EOF
-    if inside and buf:
+        # Terminated block, or unterminated SELECT at EOF
         selects.append("\n".join(buf).strip())
+        pos = start
 
     # Safety filter
     return [s for s in selects if "select" in s.lower()]
@@ -114,13 +175,25 @@ def main(argv):
         print("No files found in Converted directory")
         return 1
 
+    out_files = []
+    pbl_names = []
     for file in files:
         # Preserve version / folder structure
         rel = file.relative_to(input_root)     # e.g. 6.5/ftp8.txt
-        pbl_name = file.stem + ".pbl"          # ftp8.pbl
-
-        out_file = output_root / rel           # Selects/6.5/ftp8.txt
-        process_file(file, out_file, pbl_name)
+        pbl_names.append(file.stem + ".pbl")   # ftp8.pbl
+        out_files.append(output_root / rel)    # Selects/6.5/ftp8.txt
+
+    # Files are independent and extraction is CPU-bound: spread them over processes
+    workers = min(len(files) // FILES_PER_WORKER, os.cpu_count() or 1, MAX_WORKERS)
+    if workers <= 1:
+        for args in zip(files, out_files, pbl_names):
+            process_file(*args)
+        return 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # pool.map is lazy; iterating it re-raises an error from any file
+        for _ in pool.map(process_file, files, out_files, pbl_names, chunksize=FILES_PER_WORKER):
+            pass
 
     return 0
 
@@ -1,18 +1,46 @@
 import json
+import mmap
+import os
 import re
 import sys
 from pathlib import Path
-from collections import defaultdict
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json produces the same bytes
+    orjson = None
 
 # Supported PowerBuilder versions
-VERSIONS = ["6.5", "7.0", "8.0", "9.0", "10.5", "12.5"]
+VERSIONS = ("6.5", "7.0", "8.0", "9.0", "10.5", "12.5")
+
+# Extraction cache stored in ProjectsRoot: Converted file -> mappings, validated by
+# mtime_ns + size so unchanged sources are not rescanned (in this run or the next).
+CACHE_FILE_NAME = ".table_values_cache.json"
+
+# Cache layout and extraction rules version. Bump it whenever the patterns,
+# split_chunks or parse_chunk change: a cache with another schema is discarded.
+CACHE_SCHEMA = 1
 
-# Regex to capture full column=(...) blocks, including nested parentheses
+# orjson only indents by 2 spaces: doubling each line's leading spaces gives
+# exactly the json.dumps(indent=4) layout (strings never contain raw newlines).
+INDENT_RE = re.compile(rb"(?m)^( +)")
+
+# Regex to capture full column=(...) blocks, including nested parentheses.
+# Patterns run on the raw UTF-8 bytes (DataWindow attribute syntax is ASCII);
+# only the captured dbname/values strings are decoded.
 COLUMN_PATTERN = re.compile(
-    r'column=\((?:[^()]|\([^)]*\))*\)',
+    rb'column=\((?:[^()]|\([^)]*\))*\)',
     re.IGNORECASE | re.DOTALL,
 )
 
+# Attributes read from each column=(...) block
+DBNAME_PATTERN = re.compile(rb'dbname\s*=\s*"([^"]+)"', re.IGNORECASE)
+VALUES_PATTERN = re.compile(rb'values\s*=\s*"([^"]+)"', re.IGNORECASE | re.DOTALL)
+
+# One chunk of a values= string: runs of non-'/' characters and escaped '//' pairs.
+# A single '/' (the separator) is never part of a match.
+CHUNK_PATTERN = re.compile(r"(?:[^/]|//)+")
+
 
 def split_chunks(values_str: str) -> list[str]:
     """
@@ -23,31 +51,11 @@ def split_chunks(values_str: str) -> list[str]:
 
     Returns a list of raw chunk strings with surrounding whitespace removed.
     """
-    chunks, buf = [], []
-    i = 0
-
-    while i < len(values_str):
-        ch = values_str[i]
-
-        if ch == "/":
-            if i + 1 < len(values_str) and values_str[i + 1] == "/":
-                buf.append("/")
-                i += 2
-            else:
-                chunk = "".join(buf).strip()
-                if chunk:
-                    chunks.append(chunk)
-                buf = []
-                i += 1
-        else:
-            buf.append(ch)
-            i += 1
-
-    if buf:
-        chunk = "".join(buf).strip()
+    chunks = []
+    for raw in CHUNK_PATTERN.findall(values_str):
+        chunk = raw.replace("//", "/").strip()
         if chunk:
             chunks.append(chunk)
-
     return chunks
 
 
@@ -75,10 +83,24 @@ def parse_chunk(chunk: str) -> tuple[str, str]:
     return s, ""
 
 
-def extract_from_text(content: str) -> dict[str, dict[str, str]]:
+def decode_capture(raw: bytes) -> str:
+    """
+    Decodes a captured attribute value the way read_text(encoding="utf-8",
+    errors="ignore") would have: invalid bytes dropped, newlines translated.
+    """
+    text = raw.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def extract_from_text(content) -> dict[str, dict[str, str]]:
     """
     Extracts database value mappings from PowerBuilder source text.
 
+    content is the UTF-8 encoded text as any bytes-like object
+    (bytes, or the mmap opened by extract_from_file).
+
     For each column=(...) block found:
       - Reads dbname and values attributes.
       - Splits and parses individual value definitions.
@@ -93,18 +115,17 @@ def extract_from_text(content: str) -> dict[str, dict[str, str]]:
             ...
         }
     """
-    result = defaultdict(dict)
+    result = {}
 
     for m in COLUMN_PATTERN.finditer(content):
-        block = m.group(0)
-
-        dbm = re.search(r'dbname\s*=\s*"([^"]+)"', block, re.I)
-        valm = re.search(r'values\s*=\s*"([^"]+)"', block, re.I | re.S)
+        # Search inside the block's span; the patterns have no anchors, so no copy is needed
+        dbm = DBNAME_PATTERN.search(content, m.start(), m.end())
+        valm = VALUES_PATTERN.search(content, m.start(), m.end())
         if not dbm or not valm:
             continue
 
-        dbname = dbm.group(1)
-        chunks = split_chunks(valm.group(1))
+        dbname = decode_capture(dbm.group(1))
+        chunks = split_chunks(decode_capture(valm.group(1)))
         if not chunks:
             continue
 
@@ -113,11 +134,40 @@ def extract_from_text(content: str) -> dict[str, dict[str, str]]:
             label, code = parse_chunk(ch)
             mapping[(code or "_").upper()] = label
 
-        result[dbname].update(mapping)
+        result.setdefault(dbname, {}).update(mapping)
 
     return result
 
 
+def extract_from_file(path: Path) -> dict[str, dict[str, str]]:
+    """
+    Extracts database value mappings from a Converted file (see extract_from_text).
+
+    The file is memory-mapped rather than read and decoded as a whole:
+    the OS pages it in as the regex scans it.
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return {}  # mmap cannot map an empty file
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return extract_from_text(content)
+
+
+def dump_tables_json(tables: list[dict]) -> bytes:
+    """
+    Serializes tables.json content: 4-space indented UTF-8 JSON with platform
+    newlines, as json.dumps(indent=4, ensure_ascii=False) + write_text produced.
+    Uses orjson (C encoder) when installed; the output bytes are the same.
+    """
+    if orjson is not None:
+        payload = INDENT_RE.sub(rb"\1\1", orjson.dumps(tables, option=orjson.OPT_INDENT_2))
+    else:
+        payload = json.dumps(tables, indent=4, ensure_ascii=False).encode("utf-8")
+    if os.linesep != "\n":
+        payload = payload.replace(b"\n", os.linesep.encode("ascii"))
+    return payload
+
+
 def load_pbls_from_pbt_txt(path: Path) -> list[str]:
     """
     Reads a *.pbt.txt file and extracts referenced PBL filenames.
@@ -139,6 +189,60 @@ def load_pbls_from_pbt_txt(path: Path) -> list[str]:
     return pbls
 
 
+def load_cache(path: Path) -> dict:
+    """
+    Loads the extraction cache entries. A missing or unreadable cache, or one written
+    under another CACHE_SCHEMA, is treated as empty, which only means every source is
+    extracted again.
+    """
+    try:
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as ex:
+        print(f"[WARN] Ignoring unreadable cache: {path} ({ex})")
+        return {}
+    if not isinstance(data, dict) or data.get("schema") != CACHE_SCHEMA:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    """
+    Writes the extraction cache through a temp file so an interrupted run
+    never leaves a truncated cache behind.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    data = {"schema": CACHE_SCHEMA, "entries": cache}
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data))
+    else:
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def extract_cached(src: Path, key: str, cache: dict) -> dict[str, dict[str, str]]:
+    """
+    Returns extract_from_file(src), reusing the cache entry stored under key when
+    the file's mtime_ns and size are unchanged. New results are stored in cache.
+    """
+    st = src.stat()
+    entry = cache.get(key)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+        and isinstance(entry.get("tables"), dict)
+    ):
+        return entry["tables"]
+
+    tables = extract_from_file(src)
+    cache[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "tables": tables}
+    return tables
+
+
 def project_needs_processing(sources: list[Path], out_file: Path) -> bool:
     """
     Determines whether a project must be reprocessed.
@@ -184,6 +288,9 @@ def main(argv: list[str]) -> int:
 
     processed = skipped = no_sources = 0
 
+    cache_file = projects_root / CACHE_FILE_NAME
+    cache = load_cache(cache_file)
+
     for version in VERSIONS:
         proj_ver_dir = projects_root / version
         conv_ver_dir = converted_root / version
@@ -218,26 +325,28 @@ def main(argv: list[str]) -> int:
                 skipped += 1
                 continue
 
-            aggregated = defaultdict(dict)
+            aggregated = {}
 
             for src in sources:
-                content = src.read_text(encoding="utf-8", errors="ignore")
-                extracted = extract_from_text(content)
+                extracted = extract_cached(src, f"{version}/{src.name}", cache)
 
                 for dbname, mapping in extracted.items():
-                    aggregated[dbname].update(mapping)
+                    aggregated.setdefault(dbname, {}).update(mapping)
 
             out_file.parent.mkdir(parents=True, exist_ok=True)
-            out_file.write_text(
-                json.dumps(
-                    [{"dbname": k, "values": v} for k, v in aggregated.items()],
-                    indent=4,
-                    ensure_ascii=False,
-                ),
-                encoding="utf-8",
+            out_file.write_bytes(
+                dump_tables_json([{"dbname": k, "values": v} for k, v in aggregated.items()])
             )
 
             processed += 1
+
+    # Forget sources that no longer exist in Converted
+    removed = [key for key in cache if not (converted_root / key).exists()]
+    for key in removed:
+        del cache[key]
+
+    if processed or removed:
+        save_cache(cache_file, cache)
     return 0
 
 if __name__ == "__main__":